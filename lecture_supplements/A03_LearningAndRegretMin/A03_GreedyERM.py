@@ -1,8 +1,21 @@
 # Visualization of Greedy ERM algorithm for 1D data
+import io
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path is used instead
+    njit = None
+
+
+# Loss sequences with at least this many time steps use the compiled kernel
+_JIT_MIN_STEPS = 10_000
 
 
 def construct_worst_case_scenario(N, num_increments):
@@ -18,26 +31,63 @@ def construct_worst_case_scenario(N, num_increments):
         num_increments: Number of times L_min increases
     
     Returns:
-        losses: T x N matrix where losses[t, i] is the loss of action i at time t
+        losses: T x N int8 matrix where losses[t, i] is the loss (0 or 1) of action i at time t
         greedy_actions: List of actions chosen by greedy algorithm
     """
-    T = N * num_increments + (N - 1)  # Worst case: N losses per increment + (N-1) at end
-    losses = np.zeros((T, N))
-    
-    t = 0
-    # For each increment of L_min, make greedy suffer N losses of 1
-    for increment in range(num_increments):
-        for action in range(N):
-            # All actions except 'action' get loss 0, 'action' gets loss 1
-            losses[t, action] = 1
-            t += 1
+    # Worst case: N losses per increment + (N-1) at end
+    # For each increment of L_min, make greedy suffer N losses of 1:
+    # at step t, action t mod N gets loss 1 and all other actions get loss 0
+    increments = np.tile(np.eye(N, dtype=np.int8), (num_increments, 1))
     
     # After L_min reaches its final value, greedy can suffer up to N-1 more losses
-    for extra in range(min(N - 1, T - t)):
-        losses[t, extra] = 1
-        t += 1
+    extra = np.eye(N - 1, N, dtype=np.int8)
     
-    return losses[:t]
+    return np.vstack([increments, extra])
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _simulate_greedy_numba(losses, acc_dtype):
+        """
+        Simulate greedy in a single pass over the rows of losses.
+        
+        Keeps the running N-vector of cumulative losses. Each step adds the
+        step's losses, writes that row of the cumulative-loss matrix, and
+        finds the next action's (lowest-index) minimum in the same pass,
+        carrying the best value in a register. Sums are accumulated in
+        acc_dtype, so narrow (int8) losses are read without being widened.
+        """
+        T, N = losses.shape
+        cum = np.zeros(N, acc_dtype)
+        cumulative_losses = np.empty((T, N), acc_dtype)
+        greedy_actions = np.empty(T, np.int64)
+        greedy_cumulative = np.empty(T, acc_dtype)
+        total = cum[0]
+        action = 0  # All cumulative losses start at 0
+        for t in range(T):
+            greedy_actions[t] = action
+            total += losses[t, action]
+            greedy_cumulative[t] = total
+            
+            # Loss rows are mostly zeros (one-hot in the worst case), so only
+            # nonzero losses are written back. Every entry is still compared:
+            # the scan cannot stop at a zero minimum, since the whole row is
+            # written to cumulative_losses anyway and losses may be negative
+            best = cum[0] + losses[t, 0]
+            cum[0] = best
+            cumulative_losses[t, 0] = best
+            action = 0
+            for i in range(1, N):
+                loss = losses[t, i]
+                value = cum[i]
+                if loss != 0:
+                    value += loss
+                    cum[i] = value
+                cumulative_losses[t, i] = value
+                if value < best:  # Strict, so ties keep the lowest index
+                    best = value
+                    action = i
+        return greedy_actions, cumulative_losses, greedy_cumulative
 
 
 def simulate_greedy_algorithm(losses):
@@ -51,36 +101,30 @@ def simulate_greedy_algorithm(losses):
         greedy_actions: List of actions chosen at each time step
         cumulative_losses: T x N matrix of cumulative losses through time t
         greedy_cumulative: Array of greedy's cumulative loss at each time
+    
+    Integer losses (such as the int8 worst case) give int64 cumulative losses.
     """
     T, N = losses.shape
-    greedy_actions = []
-    cumulative_losses = np.zeros((T, N))
-    greedy_cumulative = np.zeros(T)
+    # Sums of integer losses are exact in int64; anything else accumulates in float64
+    acc_dtype = np.int64 if np.issubdtype(losses.dtype, np.integer) else np.float64
     
-    for t in range(T):
-        if t == 0:
-            # Start with action 0 (index 0)
-            action = 0
-        else:
-            # Pick action with minimum cumulative loss (break ties by choosing lowest index)
-            min_loss = cumulative_losses[t-1].min()
-            action = np.where(cumulative_losses[t-1] == min_loss)[0][0]
-        
-        greedy_actions.append(action)
-        
-        # Update cumulative losses
-        if t == 0:
-            cumulative_losses[t] = losses[t]
-        else:
-            cumulative_losses[t] = cumulative_losses[t-1] + losses[t]
-        
-        # Update greedy's cumulative loss
-        if t == 0:
-            greedy_cumulative[t] = losses[t, action]
-        else:
-            greedy_cumulative[t] = greedy_cumulative[t-1] + losses[t, action]
+    if njit is not None and T >= _JIT_MIN_STEPS:
+        greedy_actions, cumulative_losses, greedy_cumulative = _simulate_greedy_numba(
+            np.ascontiguousarray(losses), np.dtype(acc_dtype))
+        return greedy_actions.tolist(), cumulative_losses, greedy_cumulative
     
-    return greedy_actions, cumulative_losses, greedy_cumulative
+    cumulative_losses = np.cumsum(losses, axis=0, dtype=acc_dtype)
+    
+    # Greedy plays the action with minimum cumulative loss through t-1
+    # (action 0 at t=0); argmin breaks ties by choosing the lowest index.
+    # Reading rows t-1 straight from cumulative_losses avoids a shifted copy.
+    greedy_actions = np.zeros(T, dtype=np.intp)
+    if T > 1:
+        np.argmin(cumulative_losses[:-1], axis=1, out=greedy_actions[1:])
+    
+    greedy_cumulative = np.cumsum(losses[np.arange(T), greedy_actions], dtype=acc_dtype)
+    
+    return greedy_actions.tolist(), cumulative_losses, greedy_cumulative
 
 
 def visualize_worst_case(N=3, num_increments=2):
@@ -107,11 +151,13 @@ def visualize_worst_case(N=3, num_increments=2):
     theoretical_bound = N * min_loss + (N - 1)
     
     # Create visualization
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6), dpi=150)
     
     # Left plot: Bar chart of cumulative losses
     positions = np.arange(N + 1)
-    bar_heights = list(final_losses) + [greedy_loss]
+    bar_heights = np.empty(N + 1)
+    bar_heights[:N] = final_losses
+    bar_heights[N] = greedy_loss
     colors = ['steelblue'] * N + ['crimson']
     labels = [f'Action {i}' for i in range(N)] + ['Greedy']
     
@@ -140,11 +186,12 @@ def visualize_worst_case(N=3, num_increments=2):
                 ha='center', va='bottom', fontsize=10, fontweight='bold')
     
     # Right plot: Evolution over time
+    t_axis = np.arange(T)
     for i in range(N):
-        ax2.plot(range(T), cumulative_losses[:, i], marker='o', markersize=4,
+        ax2.plot(t_axis, cumulative_losses[:, i], marker='o', markersize=4,
                 label=f'Action {i}', alpha=0.7)
     
-    ax2.plot(range(T), greedy_cumulative, marker='s', markersize=5,
+    ax2.plot(t_axis, greedy_cumulative, marker='s', markersize=5,
             color='crimson', linewidth=2.5, label='Greedy', alpha=0.8)
     
     ax2.set_xlabel('Time Step $t$', fontsize=12, fontweight='bold')
@@ -162,9 +209,9 @@ def visualize_worst_case(N=3, num_increments=2):
     print(f"Number of L_min increments: {num_increments}")
     print()
     print(f"Final cumulative losses:")
-    for i in range(N):
-        marker = " ← Best" if final_losses[i] == min_loss else ""
-        print(f"  Action {i}: {final_losses[i]:.0f}{marker}")
+    is_best = final_losses == min_loss
+    print("\n".join(f"  Action {i}: {loss:.0f}{' ← Best' if best else ''}"
+                    for i, (loss, best) in enumerate(zip(final_losses.tolist(), is_best.tolist()))))
     print(f"  Greedy:    {greedy_loss:.0f}")
     print()
     print(f"L_min^T = {min_loss:.0f}")
@@ -176,20 +223,40 @@ def visualize_worst_case(N=3, num_increments=2):
     return fig, losses, greedy_actions, cumulative_losses, greedy_cumulative
 
 
-if __name__ == "__main__":
-    # Example 1: Small case (N=3, easier to understand)
-    print("Example 1: N=3 actions, 2 increments of L_min")
-    print("=" * 60)
-    fig1, losses1, actions1, cum_losses1, greedy_cum1 = visualize_worst_case(N=3, num_increments=2)
-    fig1.savefig('greedy_erm_example1_N3.png', dpi=150, bbox_inches='tight')
-    print("\n→ Saved visualization to greedy_erm_example1_N3.png")
+def _run_example(N, num_increments, path):
+    """
+    Visualize one worst-case example and save it to path.
     
-    print("\n" + "=" * 60)
-    print("\nExample 2: N=5 actions, 3 increments of L_min")
-    print("=" * 60)
-    fig2, losses2, actions2, cum_losses2, greedy_cum2 = visualize_worst_case(N=5, num_increments=3)
-    fig2.savefig('greedy_erm_example2_N5.png', dpi=150, bbox_inches='tight')
-    print("\n→ Saved visualization to greedy_erm_example2_N5.png")
+    Runs in a worker process (see __main__), so the printed summary is
+    captured and returned for the parent to print in order.
+    """
+    summary = io.StringIO()
+    with redirect_stdout(summary):
+        fig, *_ = visualize_worst_case(N=N, num_increments=num_increments)
+        # tight_layout() leaves no margin to crop, so skip savefig's bbox_inches='tight' pass
+        FigureCanvasAgg(fig).print_png(path)
+    return summary.getvalue()
+
+
+if __name__ == "__main__":
+    # The two examples are independent: render them in parallel processes,
+    # then print their summaries in order
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        # Example 1: Small case (N=3, easier to understand)
+        example1 = executor.submit(_run_example, 3, 2, 'greedy_erm_example1_N3.png')
+        # Example 2: N=5 actions, 3 increments of L_min
+        example2 = executor.submit(_run_example, 5, 3, 'greedy_erm_example2_N5.png')
+        
+        print("Example 1: N=3 actions, 2 increments of L_min")
+        print("=" * 60)
+        print(example1.result(), end="")
+        print("\n→ Saved visualization to greedy_erm_example1_N3.png")
+        
+        print("\n" + "=" * 60)
+        print("\nExample 2: N=5 actions, 3 increments of L_min")
+        print("=" * 60)
+        print(example2.result(), end="")
+        print("\n→ Saved visualization to greedy_erm_example2_N5.png")
     
     print("\n" + "=" * 60)
     print("Visualizations complete!")